@@ -0,0 +1,67 @@
+"""
+Database size and read throughput before and after moving Article.content
+out of row with database.content_store.
+
+Run from the repository root:
+    python -m benchmarks.bench_content_store [articles] [paragraphs]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from database import connection, content_store
+from database.setup import create_tables
+from models.article import Article
+
+WORDS = "the of magazine author article content review issue editor column print story".split()
+
+
+def seed(n_articles, paragraphs):
+    conn = connection.get_db_connection()
+    conn.executemany("INSERT INTO authors (name) VALUES (?)", [(f"Author {i}",) for i in range(100)])
+    conn.executemany("INSERT INTO magazines (name, category) VALUES (?, ?)",
+                     [(f"Magazine {i}", "Category") for i in range(10)])
+    rows = []
+    for i in range(n_articles):
+        body = "\n\n".join(" ".join(random.choice(WORDS) for _ in range(80)) for _ in range(paragraphs))
+        rows.append((f"Title {i}", body, random.randint(1, 100), random.randint(1, 10)))
+    conn.executemany("INSERT INTO articles (title, content, author_id, magazine_id) VALUES (?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def measure(label):
+    conn = connection.get_db_connection()
+    conn.execute("VACUUM")
+    start = time.perf_counter()
+    for author_id in range(1, 101):
+        conn.execute("SELECT title FROM articles WHERE author_id = ?", (author_id,)).fetchall()
+    titles = time.perf_counter() - start
+    conn.close()
+
+    start = time.perf_counter()
+    chars = sum(len(article.content) for article in Article.get_all())
+    contents = time.perf_counter() - start
+
+    size = os.path.getsize(connection.DATABASE_NAME)
+    print(f"{label:10s} size {size / 1024:10.1f} KiB   title scans {titles * 1000:8.1f} ms   "
+          f"full content read {contents * 1000:8.1f} ms ({chars / contents / 1e6:.1f} Mchar/s)")
+
+
+def main(n_articles=5000, paragraphs=6):
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        connection.DATABASE_NAME = os.path.join(tmp, "bench.db")
+        create_tables()
+        seed(n_articles, paragraphs)
+        measure("inline")
+        start = time.perf_counter()
+        content_store.enable()
+        print(f"migrated with {content_store.DEFAULT_CODEC} in {(time.perf_counter() - start) * 1000:.1f} ms")
+        measure("out-of-row")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
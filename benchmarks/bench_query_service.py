@@ -0,0 +1,62 @@
+"""
+Throughput of Magazine.contributors served in-process vs. by QueryService.
+
+Run from the repository root:
+    python -m benchmarks.bench_query_service [authors] [magazines] [articles] [calls]
+"""
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+from database import connection
+from database.setup import create_tables
+from models.query_service import QueryService, run_query
+
+
+def seed(n_authors, n_magazines, n_articles):
+    conn = connection.get_db_connection()
+    conn.executemany("INSERT INTO authors (name) VALUES (?)",
+                     [(f"Author {i}",) for i in range(n_authors)])
+    conn.executemany("INSERT INTO magazines (name, category) VALUES (?, ?)",
+                     [(f"Magazine {i}", f"Category {i % 10}") for i in range(n_magazines)])
+    conn.executemany(
+        "INSERT INTO articles (title, content, author_id, magazine_id) VALUES (?, ?, ?, ?)",
+        [(f"Title {i}", "Lorem ipsum " * 20, random.randint(1, n_authors), random.randint(1, n_magazines))
+         for i in range(n_articles)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def main(n_authors=2000, n_magazines=200, n_articles=200000, n_calls=2000):
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        connection.DATABASE_NAME = os.path.join(tmp, "bench.db")
+        create_tables()
+        seed(n_authors, n_magazines, n_articles)
+        ids = [random.randint(1, n_magazines) for _ in range(n_calls)]
+
+        conn = connection.get_read_only_connection()
+        start = time.perf_counter()
+        for magazine_id in ids:
+            run_query(conn, "Magazine.contributors", magazine_id)
+        elapsed = time.perf_counter() - start
+        conn.close()
+        print(f"in-process      {n_calls / elapsed:10.1f} calls/s")
+
+        cores = multiprocessing.cpu_count()
+        steps = sorted({2 ** i for i in range(cores.bit_length()) if 2 ** i < cores} | {cores})
+        for processes in steps:
+            with QueryService(processes=processes) as service:
+                service.map("Magazine.contributors", ids[:processes])  # warm up workers
+                start = time.perf_counter()
+                service.map("Magazine.contributors", ids)
+                elapsed = time.perf_counter() - start
+            print(f"{processes:3d} worker(s)   {n_calls / elapsed:10.1f} calls/s")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
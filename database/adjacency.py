@@ -0,0 +1,108 @@
+"""
+Author-magazine bipartite adjacency index.
+
+author_magazines holds one row per (author, magazine) pair with the number of
+articles the author has published in that magazine as its weight. Triggers on
+articles keep it up to date, so co-contributor queries read two small index
+ranges instead of grouping the articles table on every call.
+"""
+from .connection import get_db_connection
+
+def is_enabled(cursor):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'author_magazines'")
+    return cursor.fetchone() is not None
+
+def source_sql(cursor):
+    """ SQL yielding (author_id, magazine_id, weight), from the index if it exists. """
+    if is_enabled(cursor):
+        return "SELECT author_id, magazine_id, weight FROM author_magazines"
+    return """
+        SELECT author_id, magazine_id, COUNT(*) AS weight
+        FROM articles
+        WHERE author_id IS NOT NULL AND magazine_id IS NOT NULL
+        GROUP BY author_id, magazine_id
+    """
+
+def enable():
+    """ Create author_magazines, its maintenance triggers, and backfill it. """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS author_magazines (
+            author_id INTEGER NOT NULL,
+            magazine_id INTEGER NOT NULL,
+            weight INTEGER NOT NULL,
+            PRIMARY KEY (author_id, magazine_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_author_magazines_magazine
+        ON author_magazines (magazine_id, author_id, weight)
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS author_magazines_article_insert
+        AFTER INSERT ON articles
+        WHEN NEW.author_id IS NOT NULL AND NEW.magazine_id IS NOT NULL
+        BEGIN
+            INSERT INTO author_magazines (author_id, magazine_id, weight)
+            VALUES (NEW.author_id, NEW.magazine_id, 1)
+            ON CONFLICT (author_id, magazine_id) DO UPDATE SET weight = weight + 1;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS author_magazines_article_delete
+        AFTER DELETE ON articles
+        WHEN OLD.author_id IS NOT NULL AND OLD.magazine_id IS NOT NULL
+        BEGIN
+            UPDATE author_magazines SET weight = weight - 1
+            WHERE author_id = OLD.author_id AND magazine_id = OLD.magazine_id;
+            DELETE FROM author_magazines
+            WHERE author_id = OLD.author_id AND magazine_id = OLD.magazine_id AND weight <= 0;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS author_magazines_article_update
+        AFTER UPDATE OF author_id, magazine_id ON articles
+        BEGIN
+            UPDATE author_magazines SET weight = weight - 1
+            WHERE author_id = OLD.author_id AND magazine_id = OLD.magazine_id;
+            DELETE FROM author_magazines
+            WHERE author_id = OLD.author_id AND magazine_id = OLD.magazine_id AND weight <= 0;
+            INSERT INTO author_magazines (author_id, magazine_id, weight)
+            SELECT NEW.author_id, NEW.magazine_id, 1
+            WHERE NEW.author_id IS NOT NULL AND NEW.magazine_id IS NOT NULL
+            ON CONFLICT (author_id, magazine_id) DO UPDATE SET weight = weight + 1;
+        END
+    ''')
+
+    # Rebuild from scratch so re-running enable() never double counts.
+    cursor.execute("DELETE FROM author_magazines")
+    cursor.execute('''
+        INSERT INTO author_magazines (author_id, magazine_id, weight)
+        SELECT author_id, magazine_id, COUNT(*)
+        FROM articles
+        WHERE author_id IS NOT NULL AND magazine_id IS NOT NULL
+        GROUP BY author_id, magazine_id
+    ''')
+
+    conn.commit()
+    cursor.close()
+    conn.close()
+
+def drop():
+    """ Drop author_magazines and its triggers; queries fall back to articles. """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    for trigger in (
+        'author_magazines_article_insert',
+        'author_magazines_article_delete',
+        'author_magazines_article_update',
+    ):
+        cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    cursor.execute('DROP TABLE IF EXISTS author_magazines')
+
+    conn.commit()
+    cursor.close()
+    conn.close()
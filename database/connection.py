@@ -1,4 +1,6 @@
+import os
 import sqlite3
+from pathlib import Path
 
 DATABASE_NAME = './database/magazine.db'
 
@@ -6,3 +8,9 @@ def get_db_connection():
     conn = sqlite3.connect(DATABASE_NAME)
     conn.row_factory = sqlite3.Row
     return conn
+
+def get_read_only_connection(database=None):
+    # as_uri() percent-encodes '#', '?' and '%' so they stay part of the path.
+    uri = Path(os.path.abspath(database or DATABASE_NAME)).as_uri() + '?mode=ro'
+    conn = sqlite3.connect(uri, uri=True)
+    return conn
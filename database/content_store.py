@@ -0,0 +1,138 @@
+"""
+Optional out-of-row storage for Article.content.
+
+Once enable() has run, article bodies live compressed in article_contents and
+articles.content holds an empty string, keeping the articles table pages small
+for scans that only need titles and ids. zstd is used when the zstandard
+package is installed, zlib otherwise.
+"""
+import zlib
+
+from .connection import get_db_connection
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+BATCH_SIZE = 500
+
+DEFAULT_CODEC = "zstd" if zstandard else "zlib"
+
+def compress(text, codec=DEFAULT_CODEC):
+    data = text.encode("utf-8")
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=9).compress(data)
+    if codec == "zlib":
+        return zlib.compress(data, 9)
+    raise ValueError(f"Unknown codec: {codec}")
+
+def decompress(codec, body):
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("Content was compressed with zstd but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(body).decode("utf-8")
+    if codec == "zlib":
+        return zlib.decompress(body).decode("utf-8")
+    raise ValueError(f"Unknown codec: {codec}")
+
+def is_enabled(cursor):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'article_contents'")
+    return cursor.fetchone() is not None
+
+def save_content(cursor, article_id, text):
+    cursor.execute(
+        "INSERT OR REPLACE INTO article_contents (article_id, codec, body) VALUES (?, ?, ?)",
+        (article_id, DEFAULT_CODEC, compress(text)),
+    )
+
+def enable(batch_size=BATCH_SIZE):
+    """ Create article_contents and move existing article bodies into it.
+
+    Safe to re-run: only articles without a stored body are migrated. Each batch
+    is committed separately. Returns the number of articles migrated.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS article_contents (
+            article_id INTEGER PRIMARY KEY,
+            codec TEXT NOT NULL,
+            body BLOB NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS article_contents_article_delete
+        AFTER DELETE ON articles
+        BEGIN
+            DELETE FROM article_contents WHERE article_id = OLD.id;
+        END
+    ''')
+    conn.commit()
+
+    migrated = 0
+    last_id = 0
+    while True:
+        # Walk articles in id order; already migrated rows are skipped, never rescanned.
+        cursor.execute('''
+            SELECT id, content
+            FROM articles
+            WHERE id > ?
+              AND NOT EXISTS (SELECT 1 FROM article_contents WHERE article_id = articles.id)
+            ORDER BY id
+            LIMIT ?
+        ''', (last_id, batch_size))
+        rows = cursor.fetchall()
+        if not rows:
+            break
+        for row in rows:
+            save_content(cursor, row["id"], row["content"])
+        cursor.executemany("UPDATE articles SET content = '' WHERE id = ?", [(row["id"],) for row in rows])
+        conn.commit()
+        migrated += len(rows)
+        last_id = rows[-1]["id"]
+
+    cursor.close()
+    conn.close()
+    return migrated
+
+def disable(batch_size=BATCH_SIZE):
+    """ Move article bodies back inline and drop article_contents.
+
+    The reverse of enable(), also committed batch by batch. Returns the number
+    of articles restored.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    if not is_enabled(cursor):
+        conn.close()
+        return 0
+
+    restored = 0
+    last_id = 0
+    while True:
+        cursor.execute('''
+            SELECT article_id, codec, body
+            FROM article_contents
+            WHERE article_id > ?
+            ORDER BY article_id
+            LIMIT ?
+        ''', (last_id, batch_size))
+        rows = cursor.fetchall()
+        if not rows:
+            break
+        cursor.executemany(
+            "UPDATE articles SET content = ? WHERE id = ?",
+            [(decompress(row["codec"], row["body"]), row["article_id"]) for row in rows],
+        )
+        conn.commit()
+        restored += len(rows)
+        last_id = rows[-1]["article_id"]
+
+    cursor.execute("DROP TRIGGER IF EXISTS article_contents_article_delete")
+    cursor.execute("DROP TABLE IF EXISTS article_contents")
+    conn.commit()
+    cursor.close()
+    conn.close()
+    return restored
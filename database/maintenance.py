@@ -0,0 +1,94 @@
+from .connection import get_db_connection
+
+# Stay well below SQLite's default limit on bound parameters per statement.
+BATCH_SIZE = 500
+
+def chunks(ids, size=BATCH_SIZE):
+    ids = list(ids)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+def delete_with_articles(cursor, table, foreign_key, ids):
+    """ Delete rows from table and, set-based, every article referencing them.
+
+    Runs on the caller's cursor so the whole cascade commits as one transaction.
+    """
+    for batch in chunks(ids):
+        placeholders = ", ".join("?" for _ in batch)
+        cursor.execute(f"DELETE FROM articles WHERE {foreign_key} IN ({placeholders})", batch)
+        cursor.execute(f"DELETE FROM {table} WHERE id IN ({placeholders})", batch)
+
+def sweep_orphans(batch_size=BATCH_SIZE):
+    """ Delete articles whose author or magazine no longer exists.
+
+    Walks articles in id order, batch_size rows at a time, committing after each
+    batch so the write lock is only held briefly and no row is scanned twice.
+    Returns the number of articles removed.
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    removed = 0
+    last_id = 0
+
+    while True:
+        cursor.execute("""
+            SELECT MAX(id) FROM (
+                SELECT id FROM articles WHERE id > ? ORDER BY id LIMIT ?
+            )
+        """, (last_id, batch_size))
+        upper_id = cursor.fetchone()[0]
+        if upper_id is None:
+            break
+        cursor.execute("""
+            DELETE FROM articles
+            WHERE id > ? AND id <= ?
+              AND ((author_id IS NOT NULL
+                    AND NOT EXISTS (SELECT 1 FROM authors WHERE authors.id = articles.author_id))
+                OR (magazine_id IS NOT NULL
+                    AND NOT EXISTS (SELECT 1 FROM magazines WHERE magazines.id = articles.magazine_id)))
+        """, (last_id, upper_id))
+        conn.commit()
+        removed += cursor.rowcount
+        last_id = upper_id
+
+    cursor.close()
+    conn.close()
+    return removed
+
+def enable_incremental_vacuum():
+    """ Switch the database to incremental auto-vacuum. Rebuilds the file once. """
+    conn = get_db_connection()
+    auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    if auto_vacuum != 2:
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+    conn.close()
+
+def incremental_vacuum(pages=100):
+    """ Return free pages to the filesystem, a few at a time.
+
+    Requires enable_incremental_vacuum(); otherwise it is a no-op. Returns the
+    number of pages reclaimed.
+    """
+    conn = get_db_connection()
+    reclaimed = 0
+
+    while True:
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if free == 0:
+            break
+        conn.execute(f"PRAGMA incremental_vacuum({int(pages)})").fetchall()
+        conn.commit()
+        remaining = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if remaining >= free:
+            break
+        reclaimed += free - remaining
+
+    conn.close()
+    return reclaimed
+
+def run_cleanup(batch_size=BATCH_SIZE, pages=100):
+    """ Orphan sweep followed by incremental vacuum; safe to run on a schedule. """
+    removed = sweep_orphans(batch_size)
+    reclaimed = incremental_vacuum(pages)
+    return removed, reclaimed
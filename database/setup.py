@@ -28,6 +28,165 @@ def create_tables():
             FOREIGN KEY (magazine_id) REFERENCES magazines (id)
         )
     ''')
+    # Foreign key lookups (joins, cascading deletes) would otherwise scan articles.
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_articles_author_id ON articles (author_id)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_articles_magazine_id ON articles (magazine_id)
+    ''')
+
+    conn.commit()
+    conn.close()
+
+def create_article_listing():
+    """ Create the denormalized article_listing table and the triggers that keep it in sync. """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS article_listing (
+            article_id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            author_id INTEGER NOT NULL,
+            author_name TEXT NOT NULL,
+            magazine_id INTEGER NOT NULL,
+            magazine_name TEXT NOT NULL,
+            category TEXT NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_article_listing_category
+        ON article_listing (category, article_id)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_article_listing_author
+        ON article_listing (author_id)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_article_listing_magazine
+        ON article_listing (magazine_id)
+    ''')
+
+    # A listing row exists for every article whose author and magazine both exist.
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS article_listing_article_insert
+        AFTER INSERT ON articles
+        BEGIN
+            INSERT OR REPLACE INTO article_listing
+            SELECT NEW.id, NEW.title, authors.id, authors.name,
+                   magazines.id, magazines.name, magazines.category
+            FROM authors, magazines
+            WHERE authors.id = NEW.author_id AND magazines.id = NEW.magazine_id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS article_listing_article_update
+        AFTER UPDATE OF title, author_id, magazine_id ON articles
+        BEGIN
+            DELETE FROM article_listing WHERE article_id = OLD.id;
+            INSERT OR REPLACE INTO article_listing
+            SELECT NEW.id, NEW.title, authors.id, authors.name,
+                   magazines.id, magazines.name, magazines.category
+            FROM authors, magazines
+            WHERE authors.id = NEW.author_id AND magazines.id = NEW.magazine_id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS article_listing_article_delete
+        AFTER DELETE ON articles
+        BEGIN
+            DELETE FROM article_listing WHERE article_id = OLD.id;
+        END
+    ''')
+    # The baseline schema does not enforce foreign keys, so an article can be saved
+    # before its author or magazine exists; pick it up once the parent arrives.
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS article_listing_author_insert
+        AFTER INSERT ON authors
+        BEGIN
+            INSERT OR REPLACE INTO article_listing
+            SELECT articles.id, articles.title, NEW.id, NEW.name,
+                   magazines.id, magazines.name, magazines.category
+            FROM articles
+            JOIN magazines ON magazines.id = articles.magazine_id
+            WHERE articles.author_id = NEW.id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS article_listing_magazine_insert
+        AFTER INSERT ON magazines
+        BEGIN
+            INSERT OR REPLACE INTO article_listing
+            SELECT articles.id, articles.title, authors.id, authors.name,
+                   NEW.id, NEW.name, NEW.category
+            FROM articles
+            JOIN authors ON authors.id = articles.author_id
+            WHERE articles.magazine_id = NEW.id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS article_listing_author_update
+        AFTER UPDATE OF name ON authors
+        BEGIN
+            UPDATE article_listing SET author_name = NEW.name WHERE author_id = NEW.id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS article_listing_author_delete
+        AFTER DELETE ON authors
+        BEGIN
+            DELETE FROM article_listing WHERE author_id = OLD.id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS article_listing_magazine_update
+        AFTER UPDATE OF name, category ON magazines
+        BEGIN
+            UPDATE article_listing
+            SET magazine_name = NEW.name, category = NEW.category
+            WHERE magazine_id = NEW.id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS article_listing_magazine_delete
+        AFTER DELETE ON magazines
+        BEGIN
+            DELETE FROM article_listing WHERE magazine_id = OLD.id;
+        END
+    ''')
+
+    # Backfill rows for articles that were written before the table existed.
+    cursor.execute('''
+        INSERT OR REPLACE INTO article_listing
+        SELECT articles.id, articles.title, authors.id, authors.name,
+               magazines.id, magazines.name, magazines.category
+        FROM articles
+        JOIN authors ON authors.id = articles.author_id
+        JOIN magazines ON magazines.id = articles.magazine_id
+    ''')
+
+    conn.commit()
+    conn.close()
+
+def drop_article_listing():
+    """ Drop the article_listing table together with its triggers. """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    for trigger in (
+        'article_listing_article_insert',
+        'article_listing_article_update',
+        'article_listing_article_delete',
+        'article_listing_author_insert',
+        'article_listing_author_update',
+        'article_listing_author_delete',
+        'article_listing_magazine_insert',
+        'article_listing_magazine_update',
+        'article_listing_magazine_delete',
+    ):
+        cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    cursor.execute('DROP TABLE IF EXISTS article_listing')
 
     conn.commit()
     conn.close()
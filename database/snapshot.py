@@ -0,0 +1,210 @@
+"""
+Compact, memory-mapped snapshot of the authors/magazines/articles catalogue.
+
+Layout (native byte order, every section aligned to 8 bytes):
+
+    magic      8 bytes  b"MAGSNAP1"
+    count      int64    number of sections
+    directory  count x (offset int64, length int64), in SECTIONS order
+    sections   raw array data
+
+Ids and foreign keys are int64 arrays ordered by id. Each string column is an
+int64 offsets array (n + 1 entries) into a UTF-8 heap. The author->articles and
+magazine->articles adjacency lists are stored CSR-style: an int64 offsets array
+(n + 1 entries) into a uint32 array of article row indices.
+"""
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from bisect import bisect_left
+
+from . import content_store
+from .connection import get_db_connection
+
+MAGIC = b"MAGSNAP1"
+
+SECTIONS = (
+    ("author_ids", "q"),
+    ("author_name_offsets", "q"),
+    ("author_name_heap", "B"),
+    ("magazine_ids", "q"),
+    ("magazine_name_offsets", "q"),
+    ("magazine_name_heap", "B"),
+    ("magazine_category_offsets", "q"),
+    ("magazine_category_heap", "B"),
+    ("article_ids", "q"),
+    ("article_author_ids", "q"),
+    ("article_magazine_ids", "q"),
+    ("article_title_offsets", "q"),
+    ("article_title_heap", "B"),
+    ("article_content_offsets", "q"),
+    ("article_content_heap", "B"),
+    ("author_article_offsets", "q"),
+    ("author_article_index", "I"),
+    ("magazine_article_offsets", "q"),
+    ("magazine_article_index", "I"),
+)
+
+_HEADER = struct.Struct("=8sq")
+_ENTRY = struct.Struct("=qq")
+
+
+def _string_column(values):
+    offsets = array("q", [0])
+    heap = bytearray()
+    for value in values:
+        heap += value.encode("utf-8")
+        offsets.append(len(heap))
+    return offsets, heap
+
+
+def _adjacency(parent_ids, child_parent_ids):
+    """ Group child row indices by parent row, returning CSR offsets and indices. """
+    position = {parent_id: i for i, parent_id in enumerate(parent_ids)}
+    buckets = [[] for _ in parent_ids]
+    for child, parent_id in enumerate(child_parent_ids):
+        if parent_id in position:
+            buckets[position[parent_id]].append(child)
+    offsets = array("q", [0])
+    index = array("I")
+    for bucket in buckets:
+        index.extend(bucket)
+        offsets.append(len(index))
+    return offsets, index
+
+
+def export_snapshot(path):
+    """ Write the current contents of the database to a snapshot file at path. """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    # One read transaction, so concurrent writes cannot make the three reads disagree.
+    cursor.execute("BEGIN")
+    cursor.execute("SELECT id, name FROM authors ORDER BY id")
+    authors = cursor.fetchall()
+    cursor.execute("SELECT id, name, category FROM magazines ORDER BY id")
+    magazines = cursor.fetchall()
+    if content_store.is_enabled(cursor):
+        cursor.execute("""
+            SELECT articles.id, articles.title, articles.content, articles.author_id, articles.magazine_id,
+                   article_contents.codec, article_contents.body
+            FROM articles
+            LEFT JOIN article_contents ON article_contents.article_id = articles.id
+            ORDER BY articles.id
+        """)
+    else:
+        cursor.execute("""
+            SELECT id, title, content, author_id, magazine_id, NULL AS codec, NULL AS body
+            FROM articles
+            ORDER BY id
+        """)
+    articles = cursor.fetchall()
+    cursor.execute("COMMIT")
+    cursor.close()
+    conn.close()
+    contents = [row["content"] if row["body"] is None else content_store.decompress(row["codec"], row["body"])
+                for row in articles]
+
+    author_ids = array("q", [row["id"] for row in authors])
+    magazine_ids = array("q", [row["id"] for row in magazines])
+    # Missing foreign keys are stored as 0, which never matches an AUTOINCREMENT id.
+    article_author_ids = array("q", [row["author_id"] or 0 for row in articles])
+    article_magazine_ids = array("q", [row["magazine_id"] or 0 for row in articles])
+
+    sections = {"author_ids": author_ids, "magazine_ids": magazine_ids}
+    sections["author_name_offsets"], sections["author_name_heap"] = _string_column(row["name"] for row in authors)
+    sections["magazine_name_offsets"], sections["magazine_name_heap"] = _string_column(row["name"] for row in magazines)
+    sections["magazine_category_offsets"], sections["magazine_category_heap"] = _string_column(row["category"] for row in magazines)
+    sections["article_ids"] = array("q", [row["id"] for row in articles])
+    sections["article_author_ids"] = article_author_ids
+    sections["article_magazine_ids"] = article_magazine_ids
+    sections["article_title_offsets"], sections["article_title_heap"] = _string_column(row["title"] for row in articles)
+    sections["article_content_offsets"], sections["article_content_heap"] = _string_column(contents)
+    sections["author_article_offsets"], sections["author_article_index"] = _adjacency(author_ids, article_author_ids)
+    sections["magazine_article_offsets"], sections["magazine_article_index"] = _adjacency(magazine_ids, article_magazine_ids)
+
+    position = _HEADER.size + _ENTRY.size * len(SECTIONS)
+    directory = []
+    payloads = []
+    for name, _ in SECTIONS:
+        data = bytes(sections[name])
+        position += -position % 8
+        directory.append((position, len(data)))
+        payloads.append((position, data))
+        position += len(data)
+
+    # Readers may have the current file mapped; never rewrite it in place. Write a
+    # sibling file and atomically swap it in, so old mappings keep the old inode.
+    directory_name = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory_name, prefix=".snapshot-")
+    try:
+        os.chmod(tmp_path, 0o644)
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, len(SECTIONS)))
+            for offset, length in directory:
+                f.write(_ENTRY.pack(offset, length))
+            for offset, data in payloads:
+                f.write(b"\0" * (offset - f.tell()))
+                f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class Snapshot:
+    """ Read-only view over a snapshot file; arrays are cast straight from the mapping. """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        magic, count = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or count != len(SECTIONS):
+            self.close()
+            raise ValueError(f"{path} is not a catalogue snapshot")
+
+        self._views = []
+        for i, (name, typecode) in enumerate(SECTIONS):
+            offset, length = _ENTRY.unpack_from(self._buffer, _HEADER.size + i * _ENTRY.size)
+            view = self._buffer[offset:offset + length].cast(typecode)
+            self._views.append(view)
+            setattr(self, name, view)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        for view in getattr(self, "_views", []):
+            view.release()
+        self._views = []
+        self._buffer.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # A caller still holds a view into the mapping (e.g. a section
+            # slice); it is unmapped once the last such view is collected.
+            pass
+
+    @staticmethod
+    def find(ids, id):
+        """ Return the row index of id in a sorted id array, or None. """
+        i = bisect_left(ids, id)
+        if i < len(ids) and ids[i] == id:
+            return i
+        return None
+
+    @staticmethod
+    def string(offsets, heap, i):
+        return str(heap[offsets[i]:offsets[i + 1]], "utf-8")
+
+    @staticmethod
+    def neighbours(offsets, index, i):
+        """ Return the article row indices adjacent to parent row i, as a list. """
+        return index[offsets[i]:offsets[i + 1]].tolist()
@@ -1,5 +1,6 @@
 
 
+from database import content_store
 from database.connection import get_db_connection
 
 class Article:
@@ -10,12 +11,32 @@ class Article:
         self.magazine_id = magazine_id
         self.id = None  # Initialize id attribute
 
+    @property
+    def content(self):
+        # Out-of-row content is only decompressed the first time it is read.
+        if self._packed_content is not None:
+            codec, body = self._packed_content
+            self._content = content_store.decompress(codec, body)
+            self._packed_content = None
+        return self._content
+
+    @content.setter
+    def content(self, value):
+        self._content = value
+        self._packed_content = None
+
     def save(self):
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute("INSERT INTO articles (title, content, author_id, magazine_id) VALUES (?, ?, ?, ?)",
-                       (self.title, self.content, self.author_id, self.magazine_id))
-        self.id = cursor.lastrowid  # Set id attribute after insertion
+        if content_store.is_enabled(cursor):
+            cursor.execute("INSERT INTO articles (title, content, author_id, magazine_id) VALUES (?, '', ?, ?)",
+                           (self.title, self.author_id, self.magazine_id))
+            self.id = cursor.lastrowid  # Set id attribute after insertion
+            content_store.save_content(cursor, self.id, self.content)
+        else:
+            cursor.execute("INSERT INTO articles (title, content, author_id, magazine_id) VALUES (?, ?, ?, ?)",
+                           (self.title, self.content, self.author_id, self.magazine_id))
+            self.id = cursor.lastrowid  # Set id attribute after insertion
         conn.commit()
         conn.close()
 
@@ -31,27 +52,74 @@ class Article:
     def get_by_id(cls, article_id):
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM articles WHERE id = ?", (article_id,))
+        cursor.execute(cls._select_sql(cursor) + " WHERE articles.id = ?", (article_id,))
         row = cursor.fetchone()
         conn.close()
         if not row:
             return None
-        return cls(title=row["title"], content=row["content"], author_id=row["author_id"], magazine_id=row["magazine_id"])
+        return cls._from_row(row)
 
     @classmethod
     def get_all(cls):
         conn = get_db_connection()
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM articles")
+        cursor.execute(cls._select_sql(cursor))
         rows = cursor.fetchall()
         conn.close()
         articles = []
         for row in rows:
-            article = cls(title=row["title"], content=row["content"], author_id=row["author_id"], magazine_id=row["magazine_id"])
+            article = cls._from_row(row)
             article.id = row["id"]
             articles.append(article)
         return articles
 
+    @staticmethod
+    def _select_sql(cursor):
+        if content_store.is_enabled(cursor):
+            return """
+                SELECT articles.*, article_contents.codec, article_contents.body
+                FROM articles
+                LEFT JOIN article_contents ON article_contents.article_id = articles.id
+            """
+        return "SELECT articles.*, NULL AS codec, NULL AS body FROM articles"
+
+    @classmethod
+    def _from_row(cls, row):
+        article = cls(title=row["title"], content=row["content"], author_id=row["author_id"], magazine_id=row["magazine_id"])
+        if row["body"] is not None:
+            article._packed_content = (row["codec"], row["body"])
+        return article
+
+    @classmethod
+    def listing(cls, category=None, before_id=None, limit=20):
+        """ Return one page of the article_listing read model, newest first.
+
+        Pass the article_id of the last row of a page as before_id to fetch the
+        next one. Requires database.setup.create_article_listing() to have run.
+        """
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        sql = """
+            SELECT article_id, title, author_id, author_name, magazine_id, magazine_name, category
+            FROM article_listing
+        """
+        conditions = []
+        params = []
+        if category is not None:
+            conditions.append("category = ?")
+            params.append(category)
+        if before_id is not None:
+            conditions.append("article_id < ?")
+            params.append(before_id)
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY article_id DESC LIMIT ?"
+        params.append(limit)
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        conn.close()
+        return [dict(row) for row in rows]
+
     @classmethod
     def drop_table(cls):
         conn = get_db_connection()
@@ -1,14 +1,16 @@
-import sqlite3
 from database.connection import get_db_connection
-
-DATABASE_NAME = './database/magazine.db'
-
-def get_db_connection():
-    conn = sqlite3.connect(DATABASE_NAME)
-    conn.row_factory = sqlite3.Row
-    return conn
+from database import adjacency
+from database.maintenance import delete_with_articles
 
 class Author:
+    # Read query, shared with models.query_service so the two cannot drift apart.
+    ARTICLES_SQL = """
+        SELECT articles.title
+        FROM articles
+        LEFT JOIN authors ON articles.author_id = authors.id
+        WHERE authors.id = ?
+    """
+
     def __init__(self, name, id=None):
         self.id = id
         self.name = name 
@@ -56,37 +58,53 @@ class Author:
         conn.close()
 
     def delete(self):
-        """ Delete the Author object from the database. """
+        """ Delete the Author object and their articles from the database. """
         if self.id is None:
             raise ValueError("Cannot delete an author with no ID.")
 
+        type(self).delete_by_id(self.id)
+
+    def articles(self):
+        """ Retrieve articles authored by this author. """
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        cursor.execute("DELETE FROM authors WHERE id=?", (self.id,))
+        cursor.execute(self.ARTICLES_SQL, (self._id,))
+        articles = cursor.fetchall()
 
-        conn.commit()
         cursor.close()
         conn.close()
 
-    def articles(self):
-        """ Retrieve articles authored by this author. """
+        return [article["title"] for article in articles] if articles else []
+
+    def co_authors(self, limit=10):
+        """ Authors who published in the same magazines, strongest overlap first.
+
+        Returns (name, weight) pairs, where weight sums, over shared magazines,
+        the smaller of the two authors' article counts in that magazine.
+        """
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        sql = """
-            SELECT articles.title
-            FROM articles
-            LEFT JOIN authors ON articles.author_id = authors.id
-            WHERE authors.id = ?
+        source = adjacency.source_sql(cursor)
+        sql = f"""
+            SELECT authors.name, SUM(MIN(mine.weight, other.weight)) AS weight
+            FROM ({source}) AS mine
+            JOIN ({source}) AS other
+                ON other.magazine_id = mine.magazine_id AND other.author_id != mine.author_id
+            JOIN authors ON authors.id = other.author_id
+            WHERE mine.author_id = ?
+            GROUP BY other.author_id
+            ORDER BY weight DESC, other.author_id
+            LIMIT ?
         """
-        cursor.execute(sql, (self._id,))
-        articles = cursor.fetchall()
+        cursor.execute(sql, (self._id, limit))
+        rows = cursor.fetchall()
 
         cursor.close()
         conn.close()
 
-        return [article["title"] for article in articles] if articles else []
+        return [(row["name"], row["weight"]) for row in rows]
 
     @classmethod
     def get_by_id(cls, author_id):
@@ -122,11 +140,16 @@ class Author:
 
     @classmethod
     def delete_by_id(cls, author_id):
-        """ Delete an author by their ID from the database. """
+        """ Delete an author and their articles by the author's ID. """
+        cls.delete_many([author_id])
+
+    @classmethod
+    def delete_many(cls, author_ids):
+        """ Delete several authors and all of their articles in one transaction. """
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        cursor.execute("DELETE FROM authors WHERE id=?", (author_id,))
+        delete_with_articles(cursor, "authors", "author_id", author_ids)
 
         conn.commit()
         cursor.close()
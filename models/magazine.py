@@ -1,16 +1,45 @@
 import sqlite3
 
-DATABASE_NAME = './database/magazine.db'
-
-def get_db_connection():
-    conn = sqlite3.connect(DATABASE_NAME)
-    conn.row_factory = sqlite3.Row
-    return conn
+from database import adjacency
+from database.connection import get_db_connection
+from database.maintenance import delete_with_articles
 
 class Magazine:
     # Dictionary of objects saved to the database.
     all = {}
 
+    # Read queries, shared with models.query_service so the two cannot drift apart.
+    ARTICLES_SQL = """
+        SELECT articles.title
+        FROM articles
+        LEFT JOIN magazines
+        ON articles.magazine_id = magazines.id
+        WHERE magazines.id = ?
+    """
+    CONTRIBUTORS_SQL = """
+        SELECT authors.name
+        FROM authors
+        LEFT JOIN articles
+        ON authors.id = articles.author_id
+        LEFT JOIN magazines
+        ON articles.magazine_id = magazines.id
+        WHERE magazines.id = ?
+    """
+    ARTICLE_TITLES_SQL = """
+        SELECT articles.title
+        FROM articles
+        WHERE articles.magazine_id = ?
+    """
+    CONTRIBUTING_AUTHORS_SQL = """
+        SELECT authors.name
+        FROM authors
+        LEFT JOIN articles
+        ON authors.id = articles.author_id
+        WHERE articles.magazine_id = ?
+        GROUP BY authors.id
+        HAVING COUNT(articles.id) > 2
+    """
+
     def __init__(self, name, category, id=None):
         self.id = id
         self.name = name
@@ -132,13 +161,18 @@ class Magazine:
 
     @classmethod
     def delete_by_id(cls, magazine_id):
-        """ Delete a magazine by its ID from the database. """
+        """ Delete a magazine and its articles by the magazine's ID. """
+        cls.delete_many([magazine_id])
+
+    @classmethod
+    def delete_many(cls, magazine_ids):
+        """ Delete several magazines and all of their articles in one transaction. """
+        magazine_ids = list(magazine_ids)
         try:
             conn = get_db_connection()
             cursor = conn.cursor()
             
-            sql = "DELETE FROM magazines WHERE id=?"
-            cursor.execute(sql, (magazine_id,))
+            delete_with_articles(cursor, "magazines", "magazine_id", magazine_ids)
             
             conn.commit()
             
@@ -146,8 +180,8 @@ class Magazine:
             conn.close()
 
             # Remove from the class-level dictionary if exists
-            if magazine_id in cls.all:
-                del cls.all[magazine_id]
+            for magazine_id in magazine_ids:
+                cls.all.pop(magazine_id, None)
         except sqlite3.Error as e:
             print(f"An error occurred: {e}")
 
@@ -174,14 +208,7 @@ class Magazine:
             conn = get_db_connection()
             cursor = conn.cursor()
             
-            query = """
-                SELECT articles.title
-                FROM articles
-                LEFT JOIN magazines
-                ON articles.magazine_id = magazines.id
-                WHERE magazines.id = ?
-            """
-            cursor.execute(query, (self.id,))
+            cursor.execute(self.ARTICLES_SQL, (self.id,))
             articles = cursor.fetchall()
             
             cursor.close()
@@ -196,16 +223,7 @@ class Magazine:
             conn = get_db_connection()
             cursor = conn.cursor()
             
-            sql = """
-                SELECT authors.name
-                FROM authors
-                LEFT JOIN articles
-                ON authors.id = articles.author_id
-                LEFT JOIN magazines
-                ON articles.magazine_id = magazines.id
-                WHERE magazines.id = ?
-            """
-            cursor.execute(sql, (self.id,))
+            cursor.execute(self.CONTRIBUTORS_SQL, (self.id,))
             contributors = cursor.fetchall()
             
             cursor.close()
@@ -220,12 +238,7 @@ class Magazine:
             conn = get_db_connection()
             cursor = conn.cursor()
             
-            sql = """
-                SELECT articles.title
-                FROM articles
-                WHERE articles.magazine_id = ?
-            """
-            cursor.execute(sql, (self.id,))
+            cursor.execute(self.ARTICLE_TITLES_SQL, (self.id,))
             article_titles = cursor.fetchall()
             
             cursor.close()
@@ -240,16 +253,7 @@ class Magazine:
             conn = get_db_connection()
             cursor = conn.cursor()
             
-            sql = """
-                SELECT authors.name
-                FROM authors
-                LEFT JOIN articles 
-                ON authors.id = articles.author_id
-                WHERE articles.magazine_id = ?
-                GROUP BY authors.id
-                HAVING COUNT(articles.id) > 2
-            """
-            cursor.execute(sql, (self.id,))
+            cursor.execute(self.CONTRIBUTING_AUTHORS_SQL, (self.id,))
             contributing_authors = cursor.fetchall()
             
             cursor.close()
@@ -259,6 +263,38 @@ class Magazine:
         except sqlite3.Error as e:
             print(f"An error occurred: {e}")
 
+    def related_magazines(self, limit=10):
+        """ Magazines sharing contributors with this one, strongest overlap first.
+
+        Returns (name, weight) pairs, where weight sums, over shared authors,
+        the smaller of that author's article counts in the two magazines.
+        """
+        try:
+            conn = get_db_connection()
+            cursor = conn.cursor()
+            
+            source = adjacency.source_sql(cursor)
+            sql = f"""
+                SELECT magazines.name, SUM(MIN(mine.weight, other.weight)) AS weight
+                FROM ({source}) AS mine
+                JOIN ({source}) AS other
+                    ON other.author_id = mine.author_id AND other.magazine_id != mine.magazine_id
+                JOIN magazines ON magazines.id = other.magazine_id
+                WHERE mine.magazine_id = ?
+                GROUP BY other.magazine_id
+                ORDER BY weight DESC, other.magazine_id
+                LIMIT ?
+            """
+            cursor.execute(sql, (self.id, limit))
+            related_magazines = cursor.fetchall()
+            
+            cursor.close()
+            conn.close()
+            
+            return [(related["name"], related["weight"]) for related in related_magazines]
+        except sqlite3.Error as e:
+            print(f"An error occurred: {e}")
+
 def create_table():
     conn = get_db_connection()
     cursor = conn.cursor()
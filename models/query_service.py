@@ -0,0 +1,109 @@
+import functools
+import multiprocessing
+import os
+
+from database import connection
+from models.author import Author
+from models.magazine import Magazine
+
+# Read queries that can be served by the worker pool, keyed by "Model.method".
+# The SQL is the models' own, so a remote call returns exactly what the local
+# method would. Each takes the id of the model instance and selects one column.
+QUERIES = {
+    "Author.articles": Author.ARTICLES_SQL,
+    "Magazine.articles": Magazine.ARTICLES_SQL,
+    "Magazine.article_titles": Magazine.ARTICLE_TITLES_SQL,
+    "Magazine.contributors": Magazine.CONTRIBUTORS_SQL,
+    "Magazine.contributing_authors": Magazine.CONTRIBUTING_AUTHORS_SQL,
+}
+
+MODELS = {"Author": Author, "Magazine": Magazine}
+
+# Per-process read-only connection, opened by the pool initializer.
+_worker_conn = None
+
+def _init_worker(database):
+    global _worker_conn
+    _worker_conn = connection.get_read_only_connection(database)
+
+def run_query(conn, name, model_id):
+    """ Run a registered query and return its first column as a tuple. """
+    if name not in QUERIES:
+        raise ValueError(f"Unknown query: {name}")
+    cursor = conn.execute(QUERIES[name], (model_id,))
+    rows = cursor.fetchall()
+    cursor.close()
+    return tuple(row[0] for row in rows)
+
+def _dispatch(task):
+    name, model_id = task
+    return run_query(_worker_conn, name, model_id)
+
+
+class RemoteModel:
+    """ Stand-in for a model instance whose methods run on the worker pool. """
+
+    def __init__(self, service, model, id):
+        self._service = service
+        self._model = model
+        self.id = id
+
+    def __repr__(self):
+        return f'<Remote{self._model} {self.id}>'
+
+    def __getattr__(self, method):
+        # Private and dunder lookups (copy, pickle) must not reach self._model,
+        # which may not be set yet and would recurse back into __getattr__.
+        if method.startswith("_"):
+            raise AttributeError(method)
+        name = f"{self._model}.{method}"
+        if name not in QUERIES:
+            raise AttributeError(f"{self._model} has no remote method {method}")
+        model = MODELS[self._model]
+
+        @functools.wraps(getattr(model, method))
+        def remote_method():
+            return self._service.call(name, self.id)
+
+        return remote_method
+
+
+class QueryService:
+    """ Pool of worker processes, each holding its own read-only connection. """
+
+    def __init__(self, processes=None, database=None):
+        self.processes = processes or multiprocessing.cpu_count()
+        # Resolve the path up front so spawned workers open the same file.
+        self.database = os.path.abspath(database or connection.DATABASE_NAME)
+        self._pool = multiprocessing.Pool(
+            processes=self.processes,
+            initializer=_init_worker,
+            initargs=(self.database,),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+
+    def call(self, name, model_id):
+        """ Run a single model method, e.g. call("Magazine.contributors", 1). """
+        return list(self._pool.apply(_dispatch, ((name, model_id),)))
+
+    def map(self, name, model_ids, chunksize=16):
+        """ Run the same model method for many ids, spread across the workers. """
+        tasks = [(name, model_id) for model_id in model_ids]
+        results = self._pool.map(_dispatch, tasks, chunksize=chunksize)
+        return [list(result) for result in results]
+
+    def author(self, author_id):
+        return RemoteModel(self, "Author", author_id)
+
+    def magazine(self, magazine_id):
+        return RemoteModel(self, "Magazine", magazine_id)
+
@@ -0,0 +1,155 @@
+from database.snapshot import Snapshot
+
+
+class SnapshotArticle:
+    def __init__(self, catalogue, index):
+        self._catalogue = catalogue
+        self._index = index
+
+    def __repr__(self):
+        return f'<Article {self.title}>'
+
+    @property
+    def id(self):
+        return self._catalogue.snapshot.article_ids[self._index]
+
+    @property
+    def title(self):
+        s = self._catalogue.snapshot
+        return s.string(s.article_title_offsets, s.article_title_heap, self._index)
+
+    @property
+    def content(self):
+        s = self._catalogue.snapshot
+        return s.string(s.article_content_offsets, s.article_content_heap, self._index)
+
+    # The snapshot stores a missing foreign key as 0; Article reports it as None.
+    @property
+    def author_id(self):
+        return self._catalogue.snapshot.article_author_ids[self._index] or None
+
+    @property
+    def magazine_id(self):
+        return self._catalogue.snapshot.article_magazine_ids[self._index] or None
+
+    def author_name(self):
+        author = self._catalogue.author(self.author_id)
+        return author.name if author else None
+
+
+class SnapshotAuthor:
+    def __init__(self, catalogue, index):
+        self._catalogue = catalogue
+        self._index = index
+
+    def __repr__(self):
+        return f'<Author {self.name}>'
+
+    @property
+    def id(self):
+        return self._catalogue.snapshot.author_ids[self._index]
+
+    @property
+    def name(self):
+        s = self._catalogue.snapshot
+        return s.string(s.author_name_offsets, s.author_name_heap, self._index)
+
+    def articles(self):
+        """ Titles of articles written by this author. """
+        s = self._catalogue.snapshot
+        return [s.string(s.article_title_offsets, s.article_title_heap, i)
+                for i in s.neighbours(s.author_article_offsets, s.author_article_index, self._index)]
+
+
+class SnapshotMagazine:
+    def __init__(self, catalogue, index):
+        self._catalogue = catalogue
+        self._index = index
+
+    def __repr__(self):
+        return f'<Magazine {self.name}>'
+
+    @property
+    def id(self):
+        return self._catalogue.snapshot.magazine_ids[self._index]
+
+    @property
+    def name(self):
+        s = self._catalogue.snapshot
+        return s.string(s.magazine_name_offsets, s.magazine_name_heap, self._index)
+
+    @property
+    def category(self):
+        s = self._catalogue.snapshot
+        return s.string(s.magazine_category_offsets, s.magazine_category_heap, self._index)
+
+    def _article_indices(self):
+        s = self._catalogue.snapshot
+        return s.neighbours(s.magazine_article_offsets, s.magazine_article_index, self._index)
+
+    def articles(self):
+        s = self._catalogue.snapshot
+        return [s.string(s.article_title_offsets, s.article_title_heap, i) for i in self._article_indices()]
+
+    def article_titles(self):
+        return self.articles()
+
+    def contributors(self):
+        """ Author names for each article in this magazine, grouped by author as Magazine.contributors does. """
+        s = self._catalogue.snapshot
+        matches = []
+        for i in self._article_indices():
+            author_index = s.find(s.author_ids, s.article_author_ids[i])
+            if author_index is not None:
+                matches.append((author_index, i))
+        matches.sort()
+        return [s.string(s.author_name_offsets, s.author_name_heap, author_index) for author_index, _ in matches]
+
+    def contributing_authors(self):
+        """ Names of authors with more than two articles in this magazine. """
+        s = self._catalogue.snapshot
+        counts = {}
+        for i in self._article_indices():
+            author_index = s.find(s.author_ids, s.article_author_ids[i])
+            if author_index is not None:
+                counts[author_index] = counts.get(author_index, 0) + 1
+        return [s.string(s.author_name_offsets, s.author_name_heap, author_index)
+                for author_index, count in sorted(counts.items()) if count > 2]
+
+
+class Catalogue:
+    """ Read-only model facade over a snapshot written by database.snapshot.export_snapshot. """
+
+    def __init__(self, path):
+        self.snapshot = Snapshot(path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.snapshot.close()
+
+    def _lookup(self, ids, id, model):
+        index = self.snapshot.find(ids, id)
+        return None if index is None else model(self, index)
+
+    def article(self, article_id):
+        return self._lookup(self.snapshot.article_ids, article_id, SnapshotArticle)
+
+    def author(self, author_id):
+        return self._lookup(self.snapshot.author_ids, author_id, SnapshotAuthor)
+
+    def magazine(self, magazine_id):
+        return self._lookup(self.snapshot.magazine_ids, magazine_id, SnapshotMagazine)
+
+    def articles(self):
+        return [SnapshotArticle(self, i) for i in range(len(self.snapshot.article_ids))]
+
+    def authors(self):
+        return [SnapshotAuthor(self, i) for i in range(len(self.snapshot.author_ids))]
+
+    def magazines(self):
+        return [SnapshotMagazine(self, i) for i in range(len(self.snapshot.magazine_ids))]
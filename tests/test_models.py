@@ -1,27 +1,36 @@
+import copy
+import os
+import shutil
+import tempfile
 import unittest
 import sqlite3
 from models.author import Author
 from models.article import Article
 from models.magazine import Magazine
+from models.query_service import QueryService
+from models.snapshot import Catalogue
+from database import connection
 from database.connection import get_db_connection
-from database.setup import create_tables
+from database.setup import create_tables, create_article_listing
+from database.snapshot import export_snapshot
+from database.maintenance import sweep_orphans, enable_incremental_vacuum, run_cleanup
+from database import adjacency, content_store
 
 class TestModels(unittest.TestCase):
-    @classmethod
-    def setUpClass(cls):
-        create_tables()  
-        cls.conn = get_db_connection()
-
-    @classmethod
-    def tearDownClass(cls):
-        cls.conn.close()
-
     def setUp(self):
-        # Clear tables before each test
-        with self.conn:
-            self.conn.execute("DELETE FROM authors")
-            self.conn.execute("DELETE FROM articles")
-            self.conn.execute("DELETE FROM magazines")
+        # Each test gets its own database, so optional tables and triggers
+        # never leak into the tracked database/magazine.db or between tests.
+        self.tmp = tempfile.TemporaryDirectory()
+        self.database_name = connection.DATABASE_NAME
+        connection.DATABASE_NAME = os.path.join(self.tmp.name, "magazine.db")
+        Magazine.all.clear()
+        create_tables()
+        self.conn = get_db_connection()
+
+    def tearDown(self):
+        self.conn.close()
+        connection.DATABASE_NAME = self.database_name
+        self.tmp.cleanup()
 
     def test_author_creation(self):
         author = Author(name="John Doe")
@@ -108,6 +117,286 @@ class TestModels(unittest.TestCase):
         article2.save()
         self.assertEqual(magazine.contributors(), ["John Doe", "Jane Smith"])
 
+    def test_article_listing_pagination(self):
+        create_article_listing()
+        author = Author(name="John Doe")
+        author.save()
+        tech = Magazine(name="Tech Weekly", category="Technology")
+        food = Magazine(name="Food Monthly", category="Food")
+        for i in range(3):
+            Article(title=f"Tech {i}", content="Content", author_id=author.id, magazine_id=tech.id).save()
+        Article(title="Food 0", content="Content", author_id=author.id, magazine_id=food.id).save()
+
+        first_page = Article.listing(category="Technology", limit=2)
+        self.assertEqual([row["title"] for row in first_page], ["Tech 2", "Tech 1"])
+        self.assertEqual(first_page[0]["author_name"], "John Doe")
+        self.assertEqual(first_page[0]["magazine_name"], "Tech Weekly")
+        next_page = Article.listing(category="Technology", before_id=first_page[-1]["article_id"], limit=2)
+        self.assertEqual([row["title"] for row in next_page], ["Tech 0"])
+        self.assertEqual(len(Article.listing()), 4)
+
+    def test_article_listing_follows_magazine_changes(self):
+        create_article_listing()
+        author = Author(name="John Doe")
+        author.save()
+        magazine = Magazine(name="Tech Weekly", category="Technology")
+        Article(title="Test Title", content="Test Content", author_id=author.id, magazine_id=magazine.id).save()
+
+        magazine.category = "Science"
+        magazine.save()
+        self.assertEqual([row["title"] for row in Article.listing(category="Science")], ["Test Title"])
+        self.assertEqual(Article.listing(category="Technology"), [])
+
+        Magazine.delete_by_id(magazine.id)
+        self.assertEqual(Article.listing(), [])
+
+    def test_article_listing_picks_up_late_parents(self):
+        create_article_listing()
+        with self.conn:
+            self.conn.execute("INSERT INTO articles (title, content, author_id, magazine_id) VALUES (?, ?, ?, ?)",
+                              ("Early", "Content", 1000, 2000))
+        self.assertEqual(Article.listing(), [])
+        with self.conn:
+            self.conn.execute("INSERT INTO authors (id, name) VALUES (1000, 'John Doe')")
+            self.conn.execute("INSERT INTO magazines (id, name, category) VALUES (2000, 'Tech Weekly', 'Technology')")
+        self.assertEqual([row["title"] for row in Article.listing(category="Technology")], ["Early"])
+
+    def test_query_service_matches_models(self):
+        author1 = Author(name="John Doe")
+        author1.save()
+        author2 = Author(name="Jane Smith")
+        author2.save()
+        magazine = Magazine(name="Tech Weekly", category="Technology")
+        Article(title="Test Title 1", content="Test Content 1", author_id=author1.id, magazine_id=magazine.id).save()
+        Article(title="Test Title 2", content="Test Content 2", author_id=author2.id, magazine_id=magazine.id).save()
+
+        with QueryService(processes=2) as service:
+            self.assertEqual(service.magazine(magazine.id).contributors(), magazine.contributors())
+            self.assertEqual(service.author(author1.id).articles(), author1.articles())
+            self.assertEqual(service.map("Magazine.article_titles", [magazine.id, magazine.id + 1]),
+                             [magazine.article_titles(), []])
+
+        # Articles left behind by a raw delete must not show up remotely either.
+        with self.conn:
+            self.conn.execute("DELETE FROM magazines WHERE id = ?", (magazine.id,))
+        with QueryService(processes=1) as service:
+            self.assertEqual(service.magazine(magazine.id).contributors(), magazine.contributors())
+            self.assertEqual(service.magazine(magazine.id).contributors(), [])
+
+    def test_query_service_remote_model(self):
+        author = Author(name="John Doe")
+        author.save()
+        magazine = Magazine(name="Tech Weekly", category="Technology")
+        Article(title="Test Title", content="Test Content", author_id=author.id, magazine_id=magazine.id).save()
+
+        # Characters that are special in SQLite URIs must not change which file is opened.
+        odd_dir = os.path.join(self.tmp.name, "a#b?c%d")
+        os.mkdir(odd_dir)
+        odd_database = os.path.join(odd_dir, "magazine.db")
+        shutil.copy(connection.DATABASE_NAME, odd_database)
+
+        with QueryService(processes=1, database=odd_database) as service:
+            remote = service.magazine(magazine.id)
+            self.assertEqual(remote.contributors.__name__, "contributors")
+            self.assertEqual(copy.copy(remote).contributors(), ["John Doe"])
+            with self.assertRaises(AttributeError):
+                remote.save
+
+    def test_snapshot_catalogue_matches_models(self):
+        author1 = Author(name="John Doe")
+        author1.save()
+        author2 = Author(name="Jane Smith")
+        author2.save()
+        magazine = Magazine(name="Tech Weekly", category="Technology")
+        empty = Magazine(name="Empty", category="None")
+        for i in range(3):
+            Article(title=f"Test Title {i}", content=f"Content {i}", author_id=author1.id, magazine_id=magazine.id).save()
+        article = Article(title="Café", content="Crème brûlée", author_id=author2.id, magazine_id=magazine.id)
+        article.save()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "catalogue.snapshot")
+            export_snapshot(path)
+            with Catalogue(path) as catalogue:
+                self.assertEqual(catalogue.author(author1.id).articles(), author1.articles())
+                snapshot_magazine = catalogue.magazine(magazine.id)
+                self.assertEqual(snapshot_magazine.category, "Technology")
+                self.assertEqual(snapshot_magazine.contributors(), magazine.contributors())
+                self.assertEqual(snapshot_magazine.contributing_authors(), ["John Doe"])
+                self.assertEqual(catalogue.magazine(empty.id).contributors(), [])
+                self.assertEqual(catalogue.article(article.id).content, "Crème brûlée")
+                self.assertEqual(catalogue.article(article.id).author_name(), "Jane Smith")
+                self.assertIsNone(catalogue.author(author2.id + 1))
+
+    def test_snapshot_contributors_order_and_reexport(self):
+        authors = [Author(name=f"A{i}") for i in range(3)]
+        for author in authors:
+            author.save()
+        magazine = Magazine(name="Tech Weekly", category="Technology")
+        for author_index in (2, 0, 1, 0):
+            Article(title=f"By A{author_index}", content="Content", author_id=authors[author_index].id,
+                    magazine_id=magazine.id).save()
+        loose = Article(title="Loose", content="Content", author_id=None, magazine_id=None)
+        loose.save()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "catalogue.snapshot")
+            export_snapshot(path)
+            with Catalogue(path) as catalogue:
+                self.assertEqual(catalogue.magazine(magazine.id).contributors(), magazine.contributors())
+                self.assertEqual(catalogue.magazine(magazine.id).contributors(), ["A0", "A0", "A1", "A2"])
+                self.assertIsNone(catalogue.article(loose.id).author_id)
+                self.assertIsNone(catalogue.article(loose.id).magazine_id)
+
+                # Re-exporting must not disturb a catalogue that is already open.
+                Author.delete_by_id(authors[0].id)
+                export_snapshot(path)
+                self.assertEqual(catalogue.author(authors[0].id).articles(), ["By A0", "By A0"])
+                self.assertEqual(os.listdir(tmp), ["catalogue.snapshot"])
+                with Catalogue(path) as fresh:
+                    self.assertIsNone(fresh.author(authors[0].id))
+
+                # Neither adjacency results nor a slice still held into the mapping may break close().
+                neighbours = catalogue.snapshot.neighbours(catalogue.snapshot.magazine_article_offsets,
+                                                           catalogue.snapshot.magazine_article_index, 0)
+                held = catalogue.snapshot.article_title_heap[0:5]
+            self.assertEqual(neighbours, [0, 1, 2, 3])
+            self.assertEqual(bytes(held), b"By A2")
+
+    def test_delete_by_id_cascades_to_articles(self):
+        author = Author(name="John Doe")
+        author.save()
+        magazine = Magazine(name="Tech Weekly", category="Technology")
+        Article(title="Test Title", content="Test Content", author_id=author.id, magazine_id=magazine.id).save()
+
+        Author.delete_by_id(author.id)
+        self.assertIsNone(Author.get_by_id(author.id))
+        self.assertEqual(magazine.articles(), [])
+
+    def test_delete_many(self):
+        authors = [Author(name=f"Author {i}") for i in range(3)]
+        for author in authors:
+            author.save()
+        magazines = [Magazine(name=f"Magazine {i}", category="Technology") for i in range(3)]
+        for author, magazine in zip(authors, magazines):
+            Article(title="Test Title", content="Test Content", author_id=author.id, magazine_id=magazine.id).save()
+
+        Magazine.delete_many([magazine.id for magazine in magazines[:2]])
+        self.assertEqual([m.id for m in Magazine.get_all()], [magazines[2].id])
+        Author.delete_many(author.id for author in authors)
+        self.assertEqual(Author.get_all(), [])
+        self.assertEqual(Article.get_all(), [])
+
+    def test_sweep_orphans(self):
+        author = Author(name="John Doe")
+        author.save()
+        magazine = Magazine(name="Tech Weekly", category="Technology")
+        for i in range(5):
+            Article(title=f"Test Title {i}", content="Test Content", author_id=author.id, magazine_id=magazine.id).save()
+        Article(title="Orphan", content="Test Content", author_id=author.id + 1, magazine_id=magazine.id).save()
+        with self.conn:
+            self.conn.execute("DELETE FROM magazines WHERE id = ?", (magazine.id,))
+
+        self.assertEqual(sweep_orphans(batch_size=2), 6)
+        self.assertEqual(Article.get_all(), [])
+
+    def test_run_cleanup_reclaims_space_incrementally(self):
+        enable_incremental_vacuum()
+        self.assertEqual(self.conn.execute("PRAGMA auto_vacuum").fetchone()[0], 2)
+        author = Author(name="John Doe")
+        author.save()
+        magazine = Magazine(name="Tech Weekly", category="Technology")
+        for i in range(50):
+            Article(title=f"Test Title {i}", content="x" * 20000, author_id=author.id, magazine_id=magazine.id).save()
+        with self.conn:
+            self.conn.execute("DELETE FROM authors WHERE id = ?", (author.id,))
+
+        removed, reclaimed = run_cleanup(batch_size=7, pages=10)
+        self.assertEqual(removed, 50)
+        self.assertGreater(reclaimed, 0)
+        self.assertEqual(self.conn.execute("PRAGMA freelist_count").fetchone()[0], 0)
+        self.assertEqual(Article.get_all(), [])
+
+    def test_out_of_row_content(self):
+        author = Author(name="John Doe")
+        author.save()
+        magazine = Magazine(name="Tech Weekly", category="Technology")
+        before = Article(title="Before", content="Inline content " * 50, author_id=author.id, magazine_id=magazine.id)
+        before.save()
+
+        content_store.enable()
+        after = Article(title="After", content="Stored content", author_id=author.id, magazine_id=magazine.id)
+        after.save()
+
+        self.assertEqual(Article.get_by_id(before.id).content, "Inline content " * 50)
+        self.assertEqual([a.content for a in Article.get_all()], ["Inline content " * 50, "Stored content"])
+        raw = self.conn.execute("SELECT content FROM articles WHERE id = ?", (after.id,)).fetchone()
+        self.assertEqual(raw["content"], "")
+        self.assertEqual(author.articles(), ["Before", "After"])
+
+    def test_content_store_disable_restores_inline_content(self):
+        author = Author(name="John Doe")
+        author.save()
+        magazine = Magazine(name="Tech Weekly", category="Technology")
+        for i in range(5):
+            Article(title=f"Title {i}", content=f"Content {i}", author_id=author.id, magazine_id=magazine.id).save()
+
+        self.assertEqual(content_store.enable(batch_size=2), 5)
+        self.assertEqual(content_store.enable(batch_size=2), 0)
+        self.assertEqual(content_store.disable(batch_size=2), 5)
+
+        cursor = self.conn.cursor()
+        self.assertFalse(content_store.is_enabled(cursor))
+        rows = cursor.execute("SELECT content FROM articles ORDER BY id").fetchall()
+        self.assertEqual([row["content"] for row in rows], [f"Content {i}" for i in range(5)])
+
+    def test_content_codecs_round_trip(self):
+        text = "Crème brûlée " * 100
+        body = content_store.compress(text, "zlib")
+        self.assertLess(len(body), len(text))
+        self.assertEqual(content_store.decompress("zlib", body), text)
+        with self.assertRaises(ValueError):
+            content_store.compress(text, "lz4")
+
+    def _co_contributor_fixture(self):
+        authors = [Author(name=name) for name in ("John Doe", "Jane Smith", "Ann Lee", "Bob Ray")]
+        for author in authors:
+            author.save()
+        tech = Magazine(name="Tech Weekly", category="Technology")
+        science = Magazine(name="Science Daily", category="Science")
+        food = Magazine(name="Food Monthly", category="Food")
+        for author_index, magazine, count in ((0, tech, 2), (1, tech, 3), (2, tech, 1), (0, science, 1),
+                                              (2, science, 2), (3, food, 1)):
+            for i in range(count):
+                Article(title=f"Title {i}", content="Content", author_id=authors[author_index].id,
+                        magazine_id=magazine.id).save()
+        return authors, tech, science, food
+
+    def test_co_authors_and_related_magazines(self):
+        authors, tech, science, food = self._co_contributor_fixture()
+        expected_co_authors = [("Jane Smith", 2), ("Ann Lee", 2)]
+        self.assertEqual(authors[0].co_authors(), expected_co_authors)
+        self.assertEqual(tech.related_magazines(), [("Science Daily", 2)])
+
+        adjacency.enable()
+        self.assertEqual(authors[0].co_authors(), expected_co_authors)
+        self.assertEqual(authors[0].co_authors(limit=1), [("Jane Smith", 2)])
+        self.assertEqual(tech.related_magazines(), [("Science Daily", 2)])
+        self.assertEqual(food.related_magazines(), [])
+
+    def test_author_magazine_index_is_maintained(self):
+        adjacency.enable()
+        authors, tech, science, food = self._co_contributor_fixture()
+        Article(title="Crossover", content="Content", author_id=authors[3].id, magazine_id=tech.id).save()
+        self.assertEqual(authors[3].co_authors(), [("John Doe", 1), ("Jane Smith", 1), ("Ann Lee", 1)])
+
+        Author.delete_by_id(authors[2].id)
+        self.assertEqual(authors[0].co_authors(), [("Jane Smith", 2), ("Bob Ray", 1)])
+        self.assertEqual(tech.related_magazines(), [("Science Daily", 1), ("Food Monthly", 1)])
+        weights = self.conn.execute("SELECT COUNT(*) FROM author_magazines WHERE author_id = ?",
+                                    (authors[2].id,)).fetchone()[0]
+        self.assertEqual(weights, 0)
+
 if __name__ == "__main__":
     unittest.main()
 